@@ -33,3 +33,11 @@ def _docdir(request, tmp_path):
     else:
         # For normal tests, we have to yield, since this is a yield-fixture.
         yield
+
+
+@pytest.fixture
+def out_dir(tmp_path):
+    """An empty output directory, separate from the test inputs in ``tmp_path``."""
+    path = tmp_path / 'out'
+    path.mkdir()
+    return path
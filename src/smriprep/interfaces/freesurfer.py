@@ -23,16 +23,80 @@
 """Nipype's recon-all replacement."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from looseversion import LooseVersion
 from nipype import logging
 from nipype.interfaces import freesurfer as fs
 from nipype.interfaces.base import File, InputMultiObject, isdefined, traits
-from nipype.utils.filemanip import check_depends
 from niworkflows.interfaces import freesurfer as nwfs
 
 iflogger = logging.getLogger('nipype.interface')
 
+# Steps checked when resuming, for directives that do not depend on the hemisphere
+_DIRECTIVE_STEPS = {
+    'autorecon1': '_autorecon1_steps',
+    'autorecon2-volonly': '_autorecon2_volonly_steps',
+    'autorecon2-perhemi': '_autorecon2_perhemi_steps',
+    'autorecon3': '_autorecon3_steps',
+}
+
+
+@lru_cache(maxsize=1)
+def _fs_ge_73():
+    """Check (once per process) whether FreeSurfer is 7.3.0 or newer."""
+    from looseversion import LooseVersion
+
+    return fs.Info.looseversion() >= LooseVersion('7.3.0')
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _stat_mtimes(paths, dir_mtimes):
+    """Map each unique path to its modification time, or ``None`` if missing.
+
+    Files in directories that do not exist yet (``None`` in ``dir_mtimes``,
+    e.g., surf/ before autorecon2) are not stat'ed.
+    ``stat`` releases the GIL, so calls are overlapped in a thread pool to hide
+    their latency on network filesystems.
+    """
+    mtimes = dict.fromkeys(paths)
+    to_stat = [path for path in mtimes if dir_mtimes[os.path.dirname(path)] is not None]
+    # Not a module-level pool: worker threads would not survive nipype forking
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        mtimes.update(zip(to_stat, pool.map(_get_mtime, to_stat), strict=True))
+    return mtimes
+
+
+def _check_depends(targets, dependencies, mtimes):
+    """Equivalent of :func:`nipype.utils.filemanip.check_depends` over cached mtimes.
+
+    >>> mtimes = {'a': 2, 'b': 1, 'c': None}
+    >>> _check_depends(['a'], ['b'], mtimes)
+    True
+    >>> _check_depends(['b'], ['a'], mtimes)
+    False
+    >>> _check_depends(['a', 'c'], ['b'], mtimes)
+    False
+    >>> _check_depends(['a'], ['c'], mtimes)
+    Traceback (most recent call last):
+    FileNotFoundError: ...
+    """
+    tgt_times = [mtimes[tgt] for tgt in targets]
+    if None in tgt_times:
+        return False
+    dep_times = []
+    for dep in dependencies:
+        if mtimes[dep] is None:
+            raise FileNotFoundError(f'Missing dependency: {dep}')
+        dep_times.append(mtimes[dep])
+    return min(tgt_times) > max(dep_times + [0])
+
 
 class _ReconAllInputSpec(fs.preprocess.ReconAllInputSpec):
     directive = traits.Enum(
@@ -122,6 +186,7 @@ class _ReconAllInputSpec(fs.preprocess.ReconAllInputSpec):
 
 class ReconAll(fs.ReconAll):
     input_spec = _ReconAllInputSpec
+    _resume_cache = None
 
     @property
     def cmdline(self):
@@ -143,12 +208,8 @@ class ReconAll(fs.ReconAll):
             steps = []
             if isdefined(self.inputs.steps):
                 steps = [step for step in self._steps if step[0] in self.inputs.steps]
-        elif directive == 'autorecon1':
-            steps = self._autorecon1_steps
-        elif directive == 'autorecon2-volonly':
-            steps = self._autorecon2_volonly_steps
-        elif directive == 'autorecon2-perhemi':
-            steps = self._autorecon2_perhemi_steps
+        elif directive in _DIRECTIVE_STEPS:
+            steps = getattr(self, _DIRECTIVE_STEPS[directive])
         elif directive.startswith('autorecon2'):
             if isdefined(self.inputs.hemi):
                 if self.inputs.hemi == 'lh':
@@ -162,37 +223,59 @@ class ReconAll(fs.ReconAll):
                 steps = self._autorecon_lh_steps
             else:
                 steps = self._autorecon_rh_steps
-        elif directive == 'autorecon3':
-            steps = self._autorecon3_steps
         else:
             steps = self._steps
 
         no_run = True
         flags = []
+        pending = []
+        # Match whole arguments, so that e.g. -cortparc is not found in -cortparc2
+        cmd_args = set(cmd.split())
         for step, outfiles, infiles in steps:
-            flag = f'-{step}'
-            noflag = f'-no{step}'
-            if noflag in cmd:
+            if f'-no{step}' in cmd_args:
                 continue
-            elif flag in cmd:
+            elif f'-{step}' in cmd_args:
                 no_run = False
                 continue
 
             # FreeSurfer changed the meaning and order of -apas2aseg without
             # updating the recon table on the wiki. Hack it until fixed in nipype.
-            if step == 'apas2aseg' and fs.Info.looseversion() >= LooseVersion('7.3.0'):
+            if step == 'apas2aseg' and _fs_ge_73():
                 infiles = []
 
-            subj_dir = os.path.join(subjects_dir, self.inputs.subject_id)
-            if check_depends(
-                [os.path.join(subj_dir, f) for f in outfiles],
-                [os.path.join(subj_dir, f) for f in infiles],
-            ):
-                flags.append(noflag)
-            else:
-                if isdefined(self.inputs.steps):
-                    flags.append(flag)
-                no_run = False
+            pending.append((step, outfiles, infiles))
+
+        # Resolve each relative filename against the subject directory only once
+        prefix = os.path.join(subjects_dir, self.inputs.subject_id, '')
+        paths = {f: prefix + f for _, outfiles, infiles in pending for f in (*outfiles, *infiles)}
+        cache_key = (cmd, prefix, tuple(step for step, _, _ in pending))
+        if self._resume_cache is not None and cache_key in self._resume_cache:
+            pending_flags, pending_run = self._resume_cache[cache_key]
+        else:
+            dir_mtimes = {
+                dirname: _get_mtime(dirname)
+                for dirname in {os.path.dirname(path) for path in paths.values()}
+            }
+            # Stat every file once, rather than once per step that depends on it
+            mtimes = _stat_mtimes(paths.values(), dir_mtimes)
+            pending_flags = []
+            pending_run = False
+            for step, outfiles, infiles in pending:
+                if _check_depends(
+                    [paths[f] for f in outfiles],
+                    [paths[f] for f in infiles],
+                    mtimes,
+                ):
+                    pending_flags.append(f'-no{step}')
+                else:
+                    if isdefined(self.inputs.steps):
+                        pending_flags.append(f'-{step}')
+                    pending_run = True
+            if self._resume_cache is not None:
+                self._resume_cache[cache_key] = (pending_flags, pending_run)
+
+        flags += pending_flags
+        no_run = no_run and not pending_run
 
         if no_run and not self.force_run:
             iflogger.info('recon-all complete : Not running')
@@ -202,6 +285,15 @@ class ReconAll(fs.ReconAll):
         iflogger.info('resume recon-all : %s', cmd)
         return cmd
 
+    def _run_interface(self, runtime):
+        # Reuse the resume check across the cmdline reads of this run only: FreeSurfer
+        # rewrites outputs in place, so no cheap check can tell when the subject changed
+        self._resume_cache = {}
+        try:
+            return super()._run_interface(runtime)
+        finally:
+            self._resume_cache = None
+
     def _format_arg(self, name, trait_spec, value):
         # Nipype disables this if -autorecon-hemi is passed
         # We need to use it either way to prevent undesired behavior
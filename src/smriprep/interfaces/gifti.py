@@ -3,6 +3,7 @@
 import os
 
 import nibabel as nb
+import numpy as np
 from nipype.interfaces.base import File, SimpleInterface, TraitedSpec, isdefined, traits
 
 
@@ -60,29 +61,23 @@ class MetricMath(SimpleInterface):
         meta = darray.meta
         meta['Name'] = f'{subject}_{hemi}_{metric}'
 
-        datatype = darray.datatype
+        data = darray.data
+        if not data.flags.writeable:
+            data = data.copy()
+        # Operate in place on the freshly loaded array, preserving its dtype
         if self.inputs.operation == 'abs':
             # wb_command -metric-math "abs(var)"
-            data = abs(darray.data)
+            data = np.abs(data, out=data)
         elif self.inputs.operation == 'invert':
             # wb_command -metric-math "var * -1"
-            data = -darray.data
+            data = np.negative(data, out=data)
         elif self.inputs.operation == 'bin':
             # wb_command -metric-math "var > 0"
-            data = darray.data > 0
-            datatype = 'uint8'
-
-        darray = nb.gifti.GiftiDataArray(
-            data,
-            intent=darray.intent,
-            datatype=datatype,
-            encoding=darray.encoding,
-            endian=darray.endian,
-            coordsys=darray.coordsys,
-            ordering=darray.ind_ord,
-            meta=meta,
-        )
-        img.darrays[0] = darray
+            data = np.greater(data, 0, out=np.empty(data.shape, dtype=np.uint8))
+            darray.datatype = nb.nifti1.data_type_codes.code['uint8']
+
+        # Update the loaded data array, keeping its encoding and other attributes
+        darray.data = data
 
         out_filename = os.path.join(runtime.cwd, f'{subject}.{hemi}.{metric}.native.shape.gii')
         img.to_filename(out_filename)
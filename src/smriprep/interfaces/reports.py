@@ -70,7 +70,7 @@ class SummaryInterface(SimpleInterface):
     def _run_interface(self, runtime):
         segment = self._generate_segment()
         path = Path(runtime.cwd) / 'report.html'
-        path.write_text(segment)
+        path.write_text(segment, encoding='utf-8', newline='')
         self._results['out_report'] = str(path)
         return runtime
 
@@ -106,6 +106,12 @@ class SubjectSummary(SummaryInterface):
     def _generate_segment(self):
         if not isdefined(self.inputs.subjects_dir):
             freesurfer_status = 'Not run'
+        elif (
+            not isdefined(self.inputs.subject_id)
+            or not (Path(self.inputs.subjects_dir) / self.inputs.subject_id / 'mri').is_dir()
+        ):
+            # Nothing to resume, so recon-all will run (skip the full ReconAll check)
+            freesurfer_status = 'Run by sMRIPrep'
         else:
             recon = fs.ReconAll(
                 subjects_dir=self.inputs.subjects_dir,
@@ -182,8 +188,9 @@ class FSSurfaceReport(SimpleInterface):
         _anat_file = str(rootdir / 'mri' / 'brain.mgz')
         _contour_file = str(rootdir / 'mri' / 'ribbon.mgz')
 
-        anat = load(_anat_file)
-        contour_nii = load(_contour_file)
+        # Decompress each MGZ once, rather than every time the cuts and plots read the data
+        anat = _in_memory(load(_anat_file))
+        contour_nii = _in_memory(load(_contour_file))
 
         n_cuts = 7
         cuts = cuts_from_bbox(contour_nii, cuts=n_cuts)
@@ -204,3 +211,10 @@ class FSSurfaceReport(SimpleInterface):
             out_file=self._results['out_report'],
         )
         return runtime
+
+
+def _in_memory(img):
+    """Return a copy of ``img`` with its data loaded into memory."""
+    import numpy as np
+
+    return img.__class__(np.asanyarray(img.dataobj), img.affine, img.header)
@@ -23,6 +23,11 @@
 """Handling surfaces."""
 
 import os
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
 import nibabel as nb
@@ -37,6 +42,26 @@ from nipype.interfaces.base import (
     isdefined,
     traits,
 )
+from nipype.utils.filemanip import copyfile, split_filename
+
+# Surface and morphometry names; [^d] keeps "thickness" from matching "midthickness"
+_SURFACE_NAME_RE = re.compile(
+    r'(?:^|[^d])(?P<name>white|pial|inflated|midthickness|thickness|sulc|curv)'
+)
+# Midthickness surfaces may be named either way (case-insensitive)
+_MIDTHICKNESS_RE = re.compile(r'midthickness|graymid', re.IGNORECASE)
+# FreeSurfer volume geometry metadata entries (VolGeomX_R, ..., VolGeomC_S)
+_VOLGEOM_KEYS = frozenset(f'VolGeom{XYZC}_{RAS}' for XYZC in 'XYZC' for RAS in 'RAS')
+# A "Sphere" metadata value in the raw XML, as plain text or CDATA. Markup delimiters
+# never occur in (base64) data blocks, so a miss means no value can equal "Sphere".
+_SPHERE_VALUE_RE = re.compile(rb'[>\[]\s*Sphere\s*[<\]]')
+# A GeometricType entry with value "Sphere"; group 1 spans the value itself
+_SPHERE_GEOMETRY_RE = re.compile(
+    rb'<Name>\s*(?:<!\[CDATA\[)?\s*GeometricType\s*(?:\]\]>)?\s*</Name>\s*'
+    rb'<Value>\s*(?:<!\[CDATA\[)?\s*(Sphere)\s*(?:\]\]>)?\s*</Value>'
+)
+_EYE4 = np.eye(4)
+_EYE4.setflags(write=False)
 
 
 class _NormalizeSurfInputSpec(BaseInterfaceInputSpec):
@@ -139,17 +164,12 @@ class AggregateSurfaces(SimpleInterface):
     output_spec = AggregateSurfacesOutputSpec
 
     def _run_interface(self, runtime):
-        import os
-        import re
-        from collections import defaultdict
-
         container = defaultdict(list)
         inputs = (self.inputs.surfaces or []) + (self.inputs.morphometrics or [])
-        findre = re.compile(
-            r'(?:^|[^d])(?P<name>white|pial|inflated|midthickness|thickness|sulc|curv)'
-        )
-        for surface in sorted(inputs, key=os.path.basename):
-            match = findre.search(os.path.basename(surface))
+        # Sort on basenames computed once, keeping input order among equal basenames
+        named = sorted(((os.path.basename(path), path) for path in inputs), key=itemgetter(0))
+        for basename, surface in named:
+            match = _SURFACE_NAME_RE.search(basename)
             if match:
                 container[match.group('name')].append(surface)
         for name, files in container.items():
@@ -183,6 +203,39 @@ class MakeRibbon(SimpleInterface):
         return runtime
 
 
+class ApplyWorldAffineInputSpec(TraitedSpec):
+    in_surface = File(mandatory=True, exists=True, desc='the surface to transform')
+    in_affine = File(
+        mandatory=True,
+        exists=True,
+        desc='world (NIfTI) affine, as written by wb_command -surface-affine-regression',
+    )
+
+
+class ApplyWorldAffineOutputSpec(TraitedSpec):
+    out_surface = File(desc='the output transformed surface')
+
+
+class ApplyWorldAffine(SimpleInterface):
+    """Apply a world affine to the vertex coordinates of a GIFTI surface, in Python.
+
+    This interface mirrors the following command, without the ``-flirt`` option::
+
+        wb_command -surface-apply-affine ${in_surface} ${in_affine} ${out_surface}
+
+    FLIRT matrices require :class:`~smriprep.interfaces.workbench.SurfaceApplyAffine`.
+    """
+
+    input_spec = ApplyWorldAffineInputSpec
+    output_spec = ApplyWorldAffineOutputSpec
+
+    def _run_interface(self, runtime):
+        self._results['out_surface'] = apply_world_affine(
+            self.inputs.in_surface, self.inputs.in_affine, newpath=runtime.cwd
+        )
+        return runtime
+
+
 def normalize_surfs(in_file: str, transform_file: str | None, newpath: str | None = None) -> str:
     """
     Update GIFTI metadata and apply rigid coordinate correction.
@@ -196,25 +249,35 @@ def normalize_surfs(in_file: str, transform_file: str | None, newpath: str | Non
     """
 
     img = nb.load(in_file)
-    if transform_file is None:
-        transform = nt.linear.Affine()
-    else:
+    matrix = None
+    if transform_file is not None:
         xfm_fmt = {
             '.txt': 'itk',
             '.mat': 'fsl',
             '.lta': 'fs',
         }[Path(transform_file).suffix]
-        transform = nt.linear.load(transform_file, fmt=xfm_fmt)
+        matrix = _load_xfm_matrix(
+            os.path.abspath(transform_file), os.stat(transform_file).st_mtime_ns, xfm_fmt
+        )
     pointset = img.get_arrays_from_intent('NIFTI_INTENT_POINTSET')[0]
-
-    if not np.allclose(transform.matrix, np.eye(4)):
-        pointset.data = transform.map(pointset.data, inverse=True)
+    orig_meta = dict(pointset.meta)
+    modified = False
+
+    if matrix is not None and not np.allclose(matrix, _EYE4):
+        # Equivalent to transform.map(pointset.data, inverse=True)
+        rotation, translation = matrix[:3, :3], matrix[:3, 3]
+        if np.array_equal(rotation, _EYE4[:3, :3]):
+            # A pure translation is undone by negating it, without a matrix inversion
+            inverse = nb.affines.from_matvec(rotation, -translation)
+        else:
+            inverse = np.linalg.inv(matrix)
+        pointset.data = _transform_coords(pointset.data, inverse)
+        modified = True
 
     fname = os.path.basename(in_file)
-    if 'graymid' in fname.lower():
+    if _MIDTHICKNESS_RE.search(fname):
         # Rename graymid to midthickness
         fname = fname.replace('graymid', 'midthickness')
-    if 'midthickness' in fname.lower():
         pointset.meta.setdefault('AnatomicalStructureSecondary', 'MidThickness')
         pointset.meta.setdefault('GeometricType', 'Anatomical')
 
@@ -229,17 +292,43 @@ def normalize_surfs(in_file: str, transform_file: str | None, newpath: str | Non
         # Following the lead of HCP pipelines, we only adjust the coordinates
         # for anatomical surfaces. To ensure consistent treatment by FreeSurfer,
         # we leave the metadata for spherical surfaces intact.
-        for XYZC in 'XYZC':
-            for RAS in 'RAS':
-                pointset.meta.pop(f'VolGeom{XYZC}_{RAS}', None)
+        for key in _VOLGEOM_KEYS.intersection(pointset.meta):
+            del pointset.meta[key]
 
     if newpath is None:
         newpath = os.getcwd()
     out_file = os.path.join(newpath, fname)
-    img.to_filename(out_file)
+    if modified or dict(pointset.meta) != orig_meta:
+        img.to_filename(out_file)
+    else:
+        # Nothing to fix, so link (or copy) the input rather than re-encoding it
+        copyfile(in_file, out_file, copy=True, use_hardlink=True, copy_related_files=False)
     return out_file
 
 
+def _transform_coords(coords: np.ndarray, affine: np.ndarray) -> np.ndarray:
+    """Apply a 4x4 affine to an (N, 3) array of coordinates.
+
+    Floating-point coordinates keep their dtype, rather than being upcast to
+    float64 homogeneous coordinates.
+    """
+    dtype = coords.dtype if coords.dtype.kind == 'f' else np.float64
+    if np.array_equal(affine[:3, :3], _EYE4[:3, :3]):
+        # Pure translation: a single addition, no matrix product
+        return coords + affine[:3, 3].astype(dtype)
+    coords = coords @ affine[:3, :3].T.astype(dtype)
+    coords += affine[:3, 3].astype(dtype)
+    return coords
+
+
+@lru_cache(maxsize=16)
+def _load_xfm_matrix(transform_file: str, mtime_ns: int, fmt: str) -> np.ndarray:
+    # The modification time is part of the cache key, so a rewritten file is reloaded
+    matrix = nt.linear.load(transform_file, fmt=fmt).matrix
+    matrix.setflags(write=False)
+    return matrix
+
+
 def fix_gifti_metadata(in_file: str, newpath: str | None = None) -> str:
     """Fix known incompatible metadata in GIFTI files.
 
@@ -248,6 +337,25 @@ def fix_gifti_metadata(in_file: str, newpath: str | None = None) -> str:
     * FreeSurfer setting GeometryType to Sphere instead of Spherical
     """
 
+    if newpath is None:
+        newpath = os.getcwd()
+    out_file = os.path.join(newpath, os.path.basename(in_file))
+
+    with open(in_file, 'rb') as fobj:
+        data = fobj.read()
+
+    if not _SPHERE_VALUE_RE.search(data):
+        # No metadata value could be "Sphere", so there is nothing to fix
+        copyfile(in_file, out_file, copy=True, use_hardlink=True, copy_related_files=False)
+        return out_file
+
+    patched = _patch_sphere_geometry(data)
+    if patched is not None:
+        # Only the metadata string changes, so avoid re-encoding the data arrays
+        with open(out_file, 'wb') as fobj:
+            fobj.write(patched)
+        return out_file
+
     img = nb.GiftiImage.from_filename(in_file)
     pointset = img.get_arrays_from_intent('NIFTI_INTENT_POINTSET')[0]
 
@@ -257,9 +365,38 @@ def fix_gifti_metadata(in_file: str, newpath: str | None = None) -> str:
     if pointset.meta.get('GeometricType') == 'Sphere':
         pointset.meta['GeometricType'] = 'Spherical'
 
+    img.to_filename(out_file)
+    return out_file
+
+
+def _patch_sphere_geometry(data: bytes) -> bytes | None:
+    """Replace the pointset's "Sphere" GeometricType directly in the raw XML.
+
+    Returns ``None`` whenever the edit is ambiguous, so the caller can fall back
+    to a full parse with nibabel.
+    """
+    if len(_SPHERE_VALUE_RE.findall(data)) != 1 or b'ExternalFileBinary' in data:
+        return None
+    match = _SPHERE_GEOMETRY_RE.search(data)
+    if match is None:
+        return None
+    # Only the pointset is fixed, matching the nibabel code path
+    darray_start = data.rfind(b'<DataArray', 0, match.start())
+    darray_tag = data[darray_start : data.find(b'>', darray_start)]
+    if darray_start < 0 or b'NIFTI_INTENT_POINTSET' not in darray_tag:
+        return None
+    return b''.join((data[: match.start(1)], b'Spherical', data[match.end(1) :]))
+
+
+def apply_world_affine(in_surface: str, in_affine: str, newpath: str | None = None) -> str:
+    """Apply a world affine to a GIFTI surface, naming the output like wb_command."""
+    img = nb.GiftiImage.from_filename(in_surface)
+    pointset = img.get_arrays_from_intent('NIFTI_INTENT_POINTSET')[0]
+    pointset.data = _transform_coords(pointset.data, np.loadtxt(in_affine))
+
     if newpath is None:
         newpath = os.getcwd()
-    out_file = os.path.join(newpath, os.path.basename(in_file))
+    out_file = os.path.join(newpath, f'{split_filename(in_surface)[1]}_xformed.surf.gii')
     img.to_filename(out_file)
     return out_file
 
@@ -273,16 +410,26 @@ def make_ribbon(
     header = base_img.header
     header.set_data_dtype('uint8')
 
-    ribbons = [
-        (np.array(nb.load(white).dataobj) > 0) & (np.array(nb.load(pial).dataobj) < 0)
-        for white, pial in zip(white_distvols, pial_distvols, strict=True)
-    ]
+    # Hemispheres are read concurrently (gzip decompression and comparisons release
+    # the GIL) and accumulated into a single mask.
+    ribbon_data = np.zeros(base_img.shape, dtype=bool)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pairs = zip(white_distvols, pial_distvols, strict=True)
+        for hemi_ribbon in pool.map(lambda pair: _hemi_ribbon(*pair), pairs):
+            ribbon_data |= hemi_ribbon
 
     if newpath is None:
         newpath = os.getcwd()
     out_file = os.path.join(newpath, 'ribbon.nii.gz')
 
-    ribbon_data = ribbons[0] | ribbons[1]
     ribbon = base_img.__class__(ribbon_data, base_img.affine, header)
     ribbon.to_filename(out_file)
     return out_file
+
+
+def _hemi_ribbon(white_distvol: str, pial_distvol: str) -> np.ndarray:
+    # asanyarray avoids copying the data, and compares memory-mapped uncompressed inputs
+    # directly from the page cache.
+    hemi_ribbon = np.asanyarray(nb.load(white_distvol).dataobj) > 0
+    hemi_ribbon &= np.asanyarray(nb.load(pial_distvol).dataobj) < 0
+    return hemi_ribbon
@@ -23,6 +23,7 @@
 """Interfaces to get templates from TemplateFlow."""
 
 import logging
+from functools import lru_cache
 
 from nipype.interfaces.base import (
     BaseInterfaceInputSpec,
@@ -201,7 +202,7 @@ def fetch_template_files(
     if specs.get('resolution') and not isinstance(specs['resolution'], list):
         specs['resolution'] = [specs['resolution']]
 
-    available_resolutions = tf.TF_LAYOUT.get_resolutions(template=name[0])
+    available_resolutions = _get_resolutions(name[0])
     if specs.get('resolution') and not set(specs['resolution']) & set(available_resolutions):
         fallback_res = available_resolutions[0] if available_resolutions else None
         LOGGER.warning(
@@ -211,10 +212,26 @@ def fetch_template_files(
         specs['resolution'] = fallback_res
 
     files = {}
-    files['t1w'] = tf.get(name[0], desc=None, suffix='T1w', **specs)
-    files['mask'] = tf.get(name[0], desc='brain', suffix='mask', **specs) or tf.get(
+    files['t1w'] = _tf_get(name[0], desc=None, suffix='T1w', **specs)
+    files['mask'] = _tf_get(name[0], desc='brain', suffix='mask', **specs) or _tf_get(
         name[0], label='brain', suffix='mask', **specs
     )
     # Not guaranteed to exist so add fallback
-    files['t2w'] = tf.get(name[0], desc=None, suffix='T2w', **specs) or Undefined
+    files['t2w'] = _tf_get(name[0], desc=None, suffix='T2w', **specs) or Undefined
     return files
+
+
+@lru_cache
+def _get_resolutions(template):
+    return tf.TF_LAYOUT.get_resolutions(template=template)
+
+
+def _tf_get(template, **kwargs):
+    """Query TemplateFlow, reusing results for identical queries within a process."""
+    query = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in kwargs.items()))
+    return _cached_tf_get(template, query)
+
+
+@lru_cache(maxsize=256)
+def _cached_tf_get(template, query):
+    return tf.get(template, **{k: list(v) if isinstance(v, tuple) else v for k, v in query})
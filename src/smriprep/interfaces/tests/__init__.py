@@ -0,0 +1,8 @@
+import nibabel as nb
+
+
+def write_gifti(path, data, intent, meta=None):
+    """Write a single-array GIFTI file for tests, returning its path."""
+    darray = nb.gifti.GiftiDataArray(data, intent=intent, meta=meta)
+    nb.GiftiImage(darrays=[darray]).to_filename(path)
+    return path
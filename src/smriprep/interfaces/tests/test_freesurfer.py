@@ -0,0 +1,116 @@
+import os
+
+from nipype.interfaces.base import Bunch, CommandLine, Undefined
+
+from .. import freesurfer
+from ..freesurfer import ReconAll
+
+
+def _touch(path, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    os.utime(path, (mtime, mtime))
+
+
+def test_ReconAll_resume(tmp_path):
+    subj_dir = tmp_path / 'sub-01'
+    # motioncor and talairach outputs are up to date, nuintensitycor has not run
+    for fname in ('mri/rawavg.mgz', 'mri/orig.mgz'):
+        _touch(subj_dir / fname, 1000)
+    for fname in (
+        'mri/orig_nu.mgz',
+        'mri/transforms/talairach.auto.xfm',
+        'mri/transforms/talairach.xfm',
+    ):
+        _touch(subj_dir / fname, 2000)
+
+    recon = ReconAll(
+        subjects_dir=str(tmp_path),
+        subject_id='sub-01',
+        directive=Undefined,
+        steps=['motioncor', 'talairach', 'nuintensitycor'],
+    )
+    flags = recon.cmdline.split()
+    assert '-nomotioncor' in flags
+    assert '-notalairach' in flags
+    assert '-nuintensitycor' in flags
+
+    # Missing talairach outputs should be regenerated
+    (subj_dir / 'mri/transforms/talairach.xfm').unlink()
+    flags = recon.cmdline.split()
+    assert '-nomotioncor' in flags
+    assert '-talairach' in flags
+
+
+def test_ReconAll_resume_flags(tmp_path):
+    (tmp_path / 'sub-01' / 'mri').mkdir(parents=True)
+
+    recon = ReconAll(
+        subjects_dir=str(tmp_path),
+        subject_id='sub-01',
+        directive=Undefined,
+        steps=['cortparc'],
+        flags=['-nocortparc2'],
+    )
+    # -nocortparc2 must not be mistaken for -nocortparc
+    assert '-cortparc' in recon.cmdline.split()
+
+
+def test_ReconAll_resume_cache(tmp_path, monkeypatch):
+    _touch(tmp_path / 'sub-01' / 'mri' / 'rawavg.mgz', 1000)
+
+    calls = []
+    stat_mtimes = freesurfer._stat_mtimes
+
+    def _counted(*args):
+        calls.append(args)
+        return stat_mtimes(*args)
+
+    def _run_interface(self, runtime):
+        # Stand-in for CommandLine._run_interface, which reads cmdline twice
+        runtime.cmdline = self.cmdline
+        runtime.cmdline = self.cmdline
+        return runtime
+
+    monkeypatch.setattr(freesurfer, '_stat_mtimes', _counted)
+    monkeypatch.setattr(CommandLine, '_run_interface', _run_interface)
+
+    recon = ReconAll(
+        subjects_dir=str(tmp_path),
+        subject_id='sub-01',
+        directive=Undefined,
+        steps=['motioncor'],
+    )
+    runtime = recon._run_interface(Bunch())
+    assert '-motioncor' in runtime.cmdline.split()
+    assert len(calls) == 1
+    # The check is not kept past the run
+    assert recon._resume_cache is None
+
+
+def test_ReconAll_resume_rewritten(tmp_path, monkeypatch):
+    # The FreeSurfer 6-7.2 step table, where apas2aseg depends on aparc+aseg.mgz
+    monkeypatch.setattr(
+        ReconAll, '_steps', [('apas2aseg', ['mri/aseg.mgz'], ['mri/aparc+aseg.mgz'])]
+    )
+    monkeypatch.setattr(freesurfer, '_fs_ge_73', lambda: False)
+
+    mri_dir = tmp_path / 'sub-01' / 'mri'
+    _touch(mri_dir / 'aparc+aseg.mgz', 1000)
+    _touch(mri_dir / 'aseg.mgz', 2000)
+    dir_mtime = os.stat(mri_dir).st_mtime_ns
+
+    recon = ReconAll(
+        subjects_dir=str(tmp_path),
+        subject_id='sub-01',
+        directive=Undefined,
+        steps=['apas2aseg'],
+    )
+    assert recon.cmdline == 'echo recon-all: nothing to do'
+
+    # Rewrite the dependency in place, as FreeSurfer does: its directory is unchanged
+    (mri_dir / 'aparc+aseg.mgz').write_bytes(b'rewritten')
+    os.utime(mri_dir / 'aparc+aseg.mgz', (3000, 3000))
+    assert os.stat(mri_dir).st_mtime_ns == dir_mtime
+
+    assert '-apas2aseg' in recon.cmdline.split()
@@ -0,0 +1,37 @@
+import nibabel as nb
+import numpy as np
+import pytest
+
+from ..gifti import MetricMath
+from . import write_gifti
+
+
+@pytest.mark.parametrize(
+    ('operation', 'expected', 'dtype'),
+    [
+        ('invert', [1.5, 0.0, -2.0], np.float32),
+        ('abs', [1.5, 0.0, 2.0], np.float32),
+        ('bin', [0, 0, 1], np.uint8),
+    ],
+)
+def test_MetricMath(tmp_path, operation, expected, dtype):
+    metric_file = write_gifti(
+        tmp_path / 'lh.sulc.shape.gii',
+        np.array([-1.5, 0.0, 2.0], dtype=np.float32),
+        'NIFTI_INTENT_SHAPE',
+    )
+
+    result = MetricMath(
+        subject_id='sub-01',
+        hemisphere='L',
+        metric='sulc',
+        metric_file=str(metric_file),
+        operation=operation,
+    ).run(cwd=tmp_path)
+
+    img = nb.load(result.outputs.metric_file)
+    assert img.meta['AnatomicalStructurePrimary'] == 'CortexLeft'
+    darray = img.darrays[0]
+    assert darray.meta['Name'] == 'sub-01_L_sulc'
+    assert darray.data.dtype == dtype
+    assert np.array_equal(darray.data, expected)
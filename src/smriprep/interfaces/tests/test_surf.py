@@ -1,10 +1,22 @@
+from pathlib import Path
+
 import nibabel as nb
+import nitransforms as nt
 import numpy as np
+import pytest
 from nipype.pipeline import engine as pe
 
+from smriprep.interfaces.tests import write_gifti
 from smriprep.interfaces.tests.data import load as load_test_data
 
-from ..surf import MakeRibbon
+from ..surf import (
+    AggregateSurfaces,
+    ApplyWorldAffine,
+    MakeRibbon,
+    fix_gifti_metadata,
+    make_ribbon,
+    normalize_surfs,
+)
 
 
 def test_MakeRibbon(tmp_path):
@@ -28,3 +40,120 @@ def test_MakeRibbon(tmp_path):
     assert ribbon.shape == expected.shape
     assert np.allclose(ribbon.affine, expected.affine)
     assert np.array_equal(ribbon.dataobj, expected.dataobj)
+
+
+def test_make_ribbon_mismatched(tmp_path):
+    res_template = 'sub-fsaverage_res-4_hemi-{hemi}_desc-cropped_{surf}dist.nii.gz'
+    white = [load_test_data(res_template.format(hemi=hemi, surf='wm')) for hemi in 'LR']
+    pial = [load_test_data(res_template.format(hemi='L', surf='pial'))]
+
+    with pytest.raises(ValueError, match='shorter'):
+        make_ribbon(white, pial, newpath=str(tmp_path))
+
+
+@pytest.mark.parametrize('rotation', [(0.1, -0.2, 0.3), (0.0, 0.0, 0.0)])
+def test_normalize_surfs(tmp_path, out_dir, rotation):
+    coords = np.random.default_rng(0).uniform(-100, 100, (200, 3)).astype(np.float32)
+    in_file = write_gifti(
+        tmp_path / 'lh.graymid.surf.gii',
+        coords,
+        'NIFTI_INTENT_POINTSET',
+        meta={'VolGeomC_R': '0.0', 'GeometricType': 'Anatomical'},
+    )
+
+    xfm = nt.linear.Affine(
+        nb.affines.from_matvec(nb.eulerangles.euler2mat(*rotation), [1.0, -2.0, 3.0])
+    )
+    xfm_file = tmp_path / 'xfm.txt'
+    xfm.to_filename(xfm_file, fmt='itk')
+
+    out_file = normalize_surfs(str(in_file), str(xfm_file), newpath=str(out_dir))
+    assert out_file == str(out_dir / 'lh.midthickness.surf.gii')
+
+    out_pointset = nb.load(out_file).darrays[0]
+    expected = nt.linear.load(xfm_file, fmt='itk').map(coords, inverse=True)
+    assert out_pointset.data.dtype == np.float32
+    assert np.allclose(out_pointset.data, expected, atol=1e-3)
+    assert 'VolGeomC_R' not in out_pointset.meta
+    assert out_pointset.meta['AnatomicalStructureSecondary'] == 'MidThickness'
+
+
+def test_normalize_surfs_unchanged(tmp_path, out_dir):
+    in_file = write_gifti(
+        tmp_path / 'lh.white.surf.gii',
+        np.zeros((4, 3), dtype=np.float32),
+        'NIFTI_INTENT_POINTSET',
+        meta={'GeometricType': 'Anatomical'},
+    )
+
+    out_file = normalize_surfs(str(in_file), None, newpath=str(out_dir))
+    assert out_file == str(out_dir / 'lh.white.surf.gii')
+    assert Path(out_file).read_bytes() == in_file.read_bytes()
+
+
+@pytest.mark.parametrize(
+    ('geometric_type', 'expected'),
+    [
+        ('Sphere', 'Spherical'),
+        ('Anatomical', 'Anatomical'),
+    ],
+)
+def test_fix_gifti_metadata(tmp_path, out_dir, geometric_type, expected):
+    in_file = write_gifti(
+        tmp_path / 'lh.sphere.surf.gii',
+        np.zeros((4, 3), dtype=np.float32),
+        'NIFTI_INTENT_POINTSET',
+        meta={'GeometricType': geometric_type},
+    )
+
+    out_file = fix_gifti_metadata(str(in_file), newpath=str(out_dir))
+    assert out_file == str(out_dir / 'lh.sphere.surf.gii')
+    assert nb.load(out_file).darrays[0].meta['GeometricType'] == expected
+    # Only the metadata value is rewritten; the encoded data are left untouched
+    assert Path(out_file).read_bytes() == in_file.read_bytes().replace(
+        geometric_type.encode(), expected.encode()
+    )
+
+
+def test_AggregateSurfaces(tmp_path):
+    surfaces = []
+    morphometrics = []
+    for hemi in 'RL':
+        for name in ('white', 'pial', 'inflated', 'midthickness'):
+            surfaces.append(tmp_path / f'{hemi.lower()}h.{name}.surf.gii')
+        for name in ('thickness', 'sulc', 'curv'):
+            morphometrics.append(tmp_path / f'{hemi.lower()}h.{name}.shape.gii')
+    for fname in surfaces + morphometrics:
+        fname.touch()
+
+    result = AggregateSurfaces(
+        surfaces=[str(f) for f in surfaces],
+        morphometrics=[str(f) for f in morphometrics],
+    ).run()
+
+    for name in ('white', 'pial', 'inflated', 'midthickness', 'thickness', 'sulc', 'curv'):
+        files = getattr(result.outputs, name)
+        assert [Path(f).name.split('.')[:2] for f in files] == [['lh', name], ['rh', name]]
+
+
+def test_ApplyWorldAffine(tmp_path):
+    coords = np.random.default_rng(0).uniform(-100, 100, (200, 3)).astype(np.float32)
+    in_surface = write_gifti(
+        tmp_path / 'sub-01_hemi-L_sphere.surf.gii', coords, 'NIFTI_INTENT_POINTSET'
+    )
+
+    affine = nb.affines.from_matvec(nb.eulerangles.euler2mat(0.1, -0.2, 0.3), [1.0, -2.0, 3.0])
+    in_affine = tmp_path / 'affine.txt'
+    np.savetxt(in_affine, affine, delimiter='\t')
+
+    apply_affine = pe.Node(
+        ApplyWorldAffine(in_surface=in_surface, in_affine=in_affine),
+        name='apply_affine',
+        base_dir=tmp_path,
+    )
+    result = apply_affine.run()
+
+    assert Path(result.outputs.out_surface).name == 'sub-01_hemi-L_sphere.surf_xformed.surf.gii'
+    out_pointset = nb.load(result.outputs.out_surface).darrays[0]
+    assert out_pointset.data.dtype == np.float32
+    assert np.allclose(out_pointset.data, nb.affines.apply_affine(affine, coords), atol=1e-3)
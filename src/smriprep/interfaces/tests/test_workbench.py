@@ -0,0 +1,19 @@
+import pytest
+from nipype.interfaces.base import CommandLineInputSpec
+from nipype.interfaces.workbench.base import WBCommand
+
+from .. import workbench
+
+
+@pytest.mark.parametrize(
+    'interface',
+    [
+        obj
+        for obj in vars(workbench).values()
+        if isinstance(obj, type) and issubclass(obj, WBCommand) and obj is not WBCommand
+    ],
+)
+def test_WBCommand_specs(interface):
+    assert issubclass(interface.input_spec, CommandLineInputSpec)
+    assert interface.output_spec is not None
+    assert 'environ' in interface().inputs.trait_names()
@@ -19,14 +19,14 @@ class CreateSignedDistanceVolumeInputSpec(CommandLineInputSpec):
     )
     out_file = File(
         name_source=['surf_file'],
-        name_template='%s_distvol.nii.gz',
+        name_template='%s_distvol.nii',
         argstr='%s',
         position=2,
         desc='Name of output volume containing signed distances',
     )
     out_mask = File(
         name_source=['surf_file'],
-        name_template='%s_distmask.nii.gz',
+        name_template='%s_distmask.nii',
         argstr='-roi-out %s',
         desc='Name of file to store a mask where the ``out_file`` has a computed value',
     )
@@ -137,6 +137,22 @@ class CreateSignedDistanceVolume(WBCommand):
            cross through itself.  All other methods count entry (positive) and exit
            (negative) crossings of a vertical ray from the point, then counts as
            inside if the total is odd, negative, or nonzero, respectively.
+
+    Distance volumes are intermediate outputs, so they are written uncompressed
+    by default.
+
+    Example
+    -------
+    >>> from smriprep.interfaces.workbench import CreateSignedDistanceVolume
+    >>> distvol = CreateSignedDistanceVolume()
+    >>> distvol.inputs.surf_file = 'sub-01_hemi-L_midthickness.surf.gii'
+    >>> distvol.inputs.ref_file = 'sub-01_desc-warped_T1w.nii.gz'
+    >>> distvol.cmdline  # doctest: +ELLIPSIS +NORMALIZE_WHITESPACE
+    'wb_command -create-signed-distance-volume sub-01_hemi-L_midthickness.surf.gii \
+    sub-01_desc-warped_T1w.nii.gz sub-01_hemi-L_midthickness.surf_distvol.nii \
+    -approx-limit 20.000000 -approx-neighborhood 2 -exact-limit 5.000000 \
+    -fill-value 0.000000 -roi-out sub-01_hemi-L_midthickness.surf_distmask.nii \
+    -winding EVEN_ODD'
     """
 
     input_spec = CreateSignedDistanceVolumeInputSpec
@@ -417,7 +433,7 @@ class SurfaceModifySphere(WBCommand):
     _cmd = 'wb_command -surface-modify-sphere'
 
 
-class SurfaceSphereProjectUnprojectInputSpec(TraitedSpec):
+class SurfaceSphereProjectUnprojectInputSpec(CommandLineInputSpec):
     """COPY REGISTRATION DEFORMATIONS TO DIFFERENT SPHERE.
 
     wb_command -surface-sphere-project-unproject
@@ -538,7 +554,7 @@ class SurfaceSphereProjectUnproject(WBCommand):
     _cmd = 'wb_command -surface-sphere-project-unproject'
 
 
-class SurfaceResampleInputSpec(TraitedSpec):
+class SurfaceResampleInputSpec(CommandLineInputSpec):
     """RESAMPLE A SURFACE TO A DIFFERENT MESH
 
     wb_command -surface-resample
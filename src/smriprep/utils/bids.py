@@ -22,53 +22,74 @@
 #
 """Utilities to handle BIDS inputs."""
 
-from json import loads
+import os
+from collections import defaultdict
+from functools import lru_cache
+from json import dumps, loads
 from pathlib import Path
 
-from bids.layout import BIDSLayout
 from niworkflows.data import load as nwf_load
 
 import smriprep
 
+from ..__about__ import DOWNLOAD_URL, __version__
 
-def collect_derivatives(derivatives_dir, subject_id, std_spaces, spec=None, patterns=None):
-    """Gather existing derivatives and compose a cache."""
+
+def collect_derivatives(
+    derivatives_dir, subject_id, std_spaces, spec=None, patterns=None, layout=None
+):
+    """Gather existing derivatives and compose a cache.
+
+    A ``layout`` from :func:`load_derivatives_layout` may be passed to reuse one index
+    of ``derivatives_dir`` across subjects; otherwise, the dataset is indexed anew.
+    A passed layout is a snapshot: build a new one after files are added or removed.
+    """
     if spec is None or patterns is None:
-        _spec, _patterns = tuple(loads(smriprep.load_data('io_spec.json').read_text()).values())
+        _spec, _patterns = _load_io_spec()
 
         if spec is None:
             spec = _spec
         if patterns is None:
             patterns = _patterns
 
-    deriv_config = nwf_load('nipreps.json')
-    layout = BIDSLayout(derivatives_dir, config=deriv_config, validate=False)
+    if layout is None:
+        layout = load_derivatives_layout(derivatives_dir)
+
+    # Index the subject's files once, then resolve every query against the index
+    index = [
+        (bids_file.path, bids_file.get_entities())
+        for bids_file in layout.get(subject=subject_id, return_type='object')
+    ]
 
     derivs_cache = {}
     for key, qry in spec['baseline'].items():
-        qry['subject'] = subject_id
-        item = layout.get(return_type='filename', **qry)
+        item = [path for path, _ in _filter_index(index, qry)]
         if not item:
             continue
 
         derivs_cache[f't1w_{key}'] = item[0] if len(item) == 1 else item
 
+    # Bucket each kind of transform by the unset end(s), which hold the standard space
+    xfm_buckets = {}
+    for key, qry in spec['transforms'].items():
+        space_entities = [entity for entity in ('from', 'to') if not qry[entity]]
+        qry = {k: v for k, v in qry.items() if k not in space_entities}
+        bucket = defaultdict(list)
+        for path, entities in _filter_index(index, qry):
+            bucket[tuple(entities.get(entity) for entity in space_entities)].append(path)
+        xfm_buckets[key] = (len(space_entities), bucket)
+
     transforms = derivs_cache.setdefault('transforms', {})
     for _space in std_spaces:
         space = _space.replace(':cohort-', '+')
-        for key, qry in spec['transforms'].items():
-            qry = qry.copy()
-            qry['subject'] = subject_id
-            qry['from'] = qry['from'] or space
-            qry['to'] = qry['to'] or space
-            item = layout.get(return_type='filename', **qry)
+        for key, (n_space_entities, bucket) in xfm_buckets.items():
+            item = bucket.get((space,) * n_space_entities)
             if not item:
                 continue
             transforms.setdefault(_space, {})[key] = item[0] if len(item) == 1 else item
 
     for key, qry in spec['surfaces'].items():
-        qry['subject'] = subject_id
-        item = layout.get(return_type='filename', **qry)
+        item = [path for path, _ in _filter_index(index, qry)]
         if not item or len(item) != 2:
             continue
 
@@ -77,6 +98,52 @@ def collect_derivatives(derivatives_dir, subject_id, std_spaces, spec=None, patt
     return derivs_cache
 
 
+def load_derivatives_layout(derivatives_dir):
+    """Index a derivatives dataset for :func:`collect_derivatives`.
+
+    The index is not refreshed, so call again after the dataset changes on disk.
+    """
+    from bids.layout import BIDSLayout
+
+    return BIDSLayout(derivatives_dir, config=nwf_load('nipreps.json'), validate=False)
+
+
+@lru_cache(maxsize=1)
+def _load_io_spec():
+    """Parse the queries and patterns of ``io_spec.json`` (shared; do not mutate)."""
+    return tuple(loads(smriprep.load_data('io_spec.json').read_text()).values())
+
+
+def _filter_index(index, query):
+    """Select ``(path, entities)`` pairs matching a :meth:`BIDSLayout.get`-style query.
+
+    A ``None`` value requires the entity to be absent, and a list matches any of its
+    values.
+
+    >>> index = [
+    ...     ('a.nii.gz', {'suffix': 'T1w', 'extension': '.nii.gz'}),
+    ...     ('b.nii', {'suffix': 'T1w', 'desc': 'preproc', 'extension': '.nii'}),
+    ... ]
+    >>> [path for path, _ in _filter_index(index, {'suffix': 'T1w', 'desc': None})]
+    ['a.nii.gz']
+    >>> [path for path, _ in _filter_index(index, {'extension': ['.nii', '.nii.gz']})]
+    ['a.nii.gz', 'b.nii']
+
+    """
+    for path, entities in index:
+        for entity, value in query.items():
+            if value is None:
+                if entity in entities:
+                    break
+            elif isinstance(value, list):
+                if entities.get(entity) not in value:
+                    break
+            elif entities.get(entity) != value:
+                break
+        else:
+            yield path, entities
+
+
 def write_bidsignore(deriv_dir):
     bids_ignore = [
         '*.html',
@@ -109,18 +176,19 @@ def write_derivative_description(bids_dir, deriv_dir):
     >>> deriv_desc.is_file()
     True
 
+    Rewriting an unchanged description leaves the file alone:
+
+    >>> mtime = deriv_desc.stat().st_mtime_ns
+    >>> write_derivative_description(bids_dir, deriv_desc.parent)
+    >>> deriv_desc.stat().st_mtime_ns == mtime
+    True
+
     .. testcleanup::
 
     >>> tmpdir.cleanup()
 
 
     """
-    import json
-    import os
-    from pathlib import Path
-
-    from ..__about__ import DOWNLOAD_URL, __version__
-
     bids_dir = Path(bids_dir)
     deriv_dir = Path(deriv_dir)
     desc = {
@@ -155,7 +223,7 @@ def write_derivative_description(bids_dir, deriv_dir):
     orig_desc = {}
     fname = bids_dir / 'dataset_description.json'
     if fname.exists():
-        orig_desc = json.loads(fname.read_text())
+        orig_desc = loads(fname.read_text())
 
     if 'DatasetDOI' in orig_desc:
         doi = orig_desc['DatasetDOI']
@@ -168,4 +236,9 @@ def write_derivative_description(bids_dir, deriv_dir):
     if 'License' in orig_desc:
         desc['License'] = orig_desc['License']
 
-    Path.write_text(deriv_dir / 'dataset_description.json', json.dumps(desc, indent=4))
+    out_file = deriv_dir / 'dataset_description.json'
+    content = dumps(desc, indent=4)
+    # Leave an identical description (and its modification time) untouched
+    if out_file.exists() and out_file.read_text() == content:
+        return
+    out_file.write_text(content)
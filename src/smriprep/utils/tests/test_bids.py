@@ -1,6 +1,8 @@
+from copy import deepcopy
+
 from niworkflows.utils.testing import generate_bids_skeleton
 
-from ..bids import collect_derivatives
+from ..bids import _load_io_spec, collect_derivatives, load_derivatives_layout
 from . import DERIV_SKELETON
 
 
@@ -28,3 +30,42 @@ def test_collect_derivatives(tmp_path):
         'sphere_reg_msm',
     ):
         assert len(collected[surface]) == 2
+
+
+def test_collect_derivatives_spec_unchanged(tmp_path):
+    deriv_dir = tmp_path / 'derivatives'
+    generate_bids_skeleton(deriv_dir, str(DERIV_SKELETON))
+    spec = deepcopy(_load_io_spec())
+    collect_derivatives(deriv_dir, '01', ['MNI152NLin2009cAsym'])
+    # The parsed spec is cached and shared across calls, so queries must not be mutated
+    assert _load_io_spec() == spec
+
+
+def test_collect_derivatives_new_files(tmp_path):
+    deriv_dir = tmp_path / 'derivatives'
+    generate_bids_skeleton(deriv_dir, str(DERIV_SKELETON))
+    layout = load_derivatives_layout(deriv_dir)
+    xfms = collect_derivatives(deriv_dir, '01', ['MNI152NLin6Asym'], layout=layout)
+    assert 'MNI152NLin6Asym' not in xfms['transforms']
+
+    anat = deriv_dir / 'sub-01' / 'anat'
+    (anat / 'sub-01_from-T1w_to-MNI152NLin6Asym_mode-image_xfm.h5').touch()
+    (anat / 'sub-01_from-MNI152NLin6Asym_to-T1w_mode-image_xfm.h5').touch()
+
+    # A shared layout is a snapshot of the dataset; new files need a new layout
+    xfms = collect_derivatives(deriv_dir, '01', ['MNI152NLin6Asym'], layout=layout)
+    assert 'MNI152NLin6Asym' not in xfms['transforms']
+
+    layout = load_derivatives_layout(deriv_dir)
+    xfms = collect_derivatives(deriv_dir, '01', ['MNI152NLin6Asym'], layout=layout)
+    assert set(xfms['transforms']['MNI152NLin6Asym']) == {'forward', 'reverse'}
+
+
+def test_collect_derivatives_layout(tmp_path):
+    deriv_dir = tmp_path / 'derivatives'
+    generate_bids_skeleton(deriv_dir, str(DERIV_SKELETON))
+    output_spaces = ['MNI152NLin2009cAsym', 'MNIPediatricAsym:cohort-3']
+    expected = collect_derivatives(deriv_dir, '01', output_spaces)
+
+    layout = load_derivatives_layout(deriv_dir)
+    assert collect_derivatives(deriv_dir, '01', output_spaces, layout=layout) == expected
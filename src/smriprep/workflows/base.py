@@ -174,12 +174,20 @@ def init_smriprep_wf(
         if fs_subjects_dir is not None:
             fsdir.inputs.subjects_dir = str(fs_subjects_dir.absolute())
 
+    from ..utils.bids import load_derivatives_layout
+
+    # Index each derivatives dataset once and share it across subjects
+    derivatives_layouts = {
+        deriv_dir: load_derivatives_layout(deriv_dir) for deriv_dir in derivatives
+    }
+
     for subject_id in subject_list:
         single_subject_wf = init_single_subject_wf(
             sloppy=sloppy,
             debug=debug,
             freesurfer=freesurfer,
             derivatives=derivatives,
+            derivatives_layouts=derivatives_layouts,
             hires=hires,
             fs_no_resume=fs_no_resume,
             layout=layout,
@@ -233,6 +241,7 @@ def init_single_subject_wf(
     subject_id,
     bids_filters,
     cifti_output,
+    derivatives_layouts=None,
 ):
     """
     Create a single subject workflow.
@@ -324,6 +333,9 @@ def init_single_subject_wf(
     bids_filters : dict
         Provides finer specification of the pipeline input files through pybids entities filters.
         A dict with the following structure {<suffix>:{<entity>:<filter>,...},...}
+    derivatives_layouts : :obj:`dict` or None
+        Pre-indexed layouts of the ``derivatives`` directories, keyed by directory
+        (see :func:`~smriprep.utils.bids.load_derivatives_layout`)
 
     Inputs
     ------
@@ -374,8 +386,14 @@ to workflows in *sMRIPrep*'s documentation]\
     deriv_cache = {}
     std_spaces = spaces.get_spaces(nonstandard=False, dim=(3,))
     std_spaces.append('fsnative')
+    if derivatives_layouts is None:
+        derivatives_layouts = {}
     for deriv_dir in derivatives:
-        deriv_cache.update(collect_derivatives(deriv_dir, subject_id, std_spaces))
+        deriv_cache.update(
+            collect_derivatives(
+                deriv_dir, subject_id, std_spaces, layout=derivatives_layouts.get(deriv_dir)
+            )
+        )
 
     inputnode = pe.Node(niu.IdentityInterface(fields=['subjects_dir']), name='inputnode')
 
@@ -746,9 +746,9 @@ def init_fsLR_reg_wf(*, name='fsLR_reg_wf'):
 def init_msm_sulc_wf(*, sloppy: bool = False, name: str = 'msm_sulc_wf'):
     """Run MSMSulc registration to fsLR surfaces, per hemisphere."""
     from ..interfaces.msm import MSM
+    from ..interfaces.surf import ApplyWorldAffine
     from ..interfaces.workbench import (
         SurfaceAffineRegression,
-        SurfaceApplyAffine,
         SurfaceModifySphere,
     )
 
@@ -775,8 +775,9 @@ def init_msm_sulc_wf(*, sloppy: bool = False, name: str = 'msm_sulc_wf'):
     # ${SUB}.L.sphere.native.surf.gii \
     # L.mat \
     # ${SUB}.L.sphere_rot.native.surf.gii
+    # The affine is a world (NIfTI) matrix, so it is applied in Python
     apply_surface_affine = pe.MapNode(
-        SurfaceApplyAffine(),
+        ApplyWorldAffine(),
         iterfield=['in_surface', 'in_affine'],
         name='apply_surface_affine',
     )